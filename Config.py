@@ -5,18 +5,24 @@
 # Foresail-1 / PATE Monitor backend
 # Configuration values from PATE Monitor's backend
 #
-import serial
+# Serial parameters are given as the plain values of the pySerial constants
+# (PARITY_NONE = 'N', STOPBITS_ONE = 1, STOPBITS_TWO = 2, EIGHTBITS = 8),
+# so that importing Config does not import pySerial.
+import inspect
 
 class Config:
     class PSU:
         class Serial:
             port            = '/dev/ttyUSB0'    # 'auto'
-            baudrate        = 9600
-            parity          = serial.PARITY_NONE
-            stopbits        = serial.STOPBITS_TWO
-            bytesize        = serial.EIGHTBITS
+            baudrate        = 9600              # E3631 maximum
+            parity          = 'N'               # serial.PARITY_NONE
+            stopbits        = 2                 # serial.STOPBITS_TWO
+            bytesize        = 8                 # serial.EIGHTBITS
             timeout         = 0.500     # seconds, timeout has to be > 300 ms
             write_timeout   = None
+            # Where PSU.find() remembers the port it found ('' to disable).
+            # Private (0700) directory of the user running the daemon.
+            found_file      = '~/.cache/psud/port'
         class Default:
             terminal        = "P25V"    # P6V, P25V, N25V
             voltage         = 7.4       #[V] 2x 3.70 nominal LiPo cell voltage
@@ -35,9 +41,9 @@ class Config:
         class Bus:
             port                = '/dev/ttyUSB1'
             baudrate            = 115200
-            parity              = serial.PARITY_NONE
-            stopbits            = serial.STOPBITS_ONE
-            bytesize            = serial.EIGHTBITS
+            parity              = 'N'           # serial.PARITY_NONE
+            stopbits            = 1             # serial.STOPBITS_ONE
+            bytesize            = 8             # serial.EIGHTBITS
             timeout             = 0.05
             write_timeout       = None
         class Interval:
@@ -54,24 +60,35 @@ class Config:
 #
 # Not perfect, but good enough for my own purposes...
 #
+# Types that display_config() prints as values
+_PRIMITIVES = (bool, float, int, str, complex, type(None))
+_INDENT     = " " * 4
+
+def _get_name(x):
+    """Class name for classes, type name for objects."""
+    return getattr(x, '__name__', None) or type(x).__name__
+
+def _members(x):
+    """(name, value) pairs of a class or an object (with or without __slots__)."""
+    try:
+        return x.__dict__.items()
+    except AttributeError:
+        return [(k, getattr(x, k)) for k in x.__slots__ if hasattr(x, k)]
+
 def display_config(obj=Config, indent_level=0):
     """Created for class'es (might work for objects)."""
-    def get_name(x):
-        if hasattr(x, '__name__'):
-            return x.__name__           # class
-        else:
-            return type(x).__name__     # object
-    indent = 4
-    print("{}[{}]".format(" " * indent * indent_level, get_name(obj)))
-    for k, v in vars(obj).items():
+    pad = _INDENT * indent_level
+    member_pad = pad + _INDENT
+    print("{}[{}]".format(pad, _get_name(obj)))
+    for k, v in _members(obj):
         # Disregard double-underscore members
         if k[:2] != '__':
-            if type(v).__name__ in ('bool', 'float', 'int', 'str', 'long', 'complex', 'NoneType'):
-                print("{}{} = {}".format(" " * indent * (indent_level + 1), k, str(v) or "None"))
-            elif type(v).__name__ == 'type':
+            if isinstance(v, _PRIMITIVES):
+                print("{}{} = {}".format(member_pad, k, str(v) or "None"))
+            elif inspect.isclass(v):
                 # it's a class
                 display_config(v, indent_level + 1)
-            elif hasattr(v, '__class__') and hasattr(v, '__dict__'):
+            elif hasattr(v, '__dict__') or hasattr(v, '__slots__'):
                 # It's an object (instance of some class)
                 display_config(v, indent_level + 1)
             else:
@@ -12,11 +12,25 @@
 #                       database file and directory checking.
 #                       (Used by the top level script "psud").
 #   0.2.1   2019.06.13  Logging now provided by log.py.
+#   0.2.2   2026.10.15  Hot path statements executed via cached cursors.
+#                       PSU.update() SQL generated once per column set.
+#                       PSU.update() uses UPSERT when SQLite supports it.
+#                       WAL journal, 'psu' updates commit immediately.
+#                       check_db_file() compares numeric uid/gid.
+#                       Partial index for pending commands.
+#                       Autocommit connection, explicit transactions.
+#                       Status methods share a read-only connection.
 #
 #
 import os
+import grp
+import pwd
+import stat
+import atexit
 import sqlite3
 import decimal
+import pathlib
+import functools
 
 
 #
@@ -24,18 +38,86 @@ import decimal
 #
 import log
 
+
+#
+# Database file and directory ownership (see Database.check_db_file())
+#
+_OWNER_USER     = "patemon"
+_OWNER_GROUP    = "www-data"
+
+@functools.lru_cache(maxsize = None)
+def _owner_ids() -> tuple:
+    """Resolve (uid, gid) of the required owner once. Returns None if the user or group does not exist."""
+    try:
+        return (
+            pwd.getpwnam(_OWNER_USER).pw_uid,
+            grp.getgrnam(_OWNER_GROUP).gr_gid
+        )
+    except KeyError:
+        return None
+
+@functools.lru_cache(maxsize = None)
+def _owner_name(uid: int, gid: int) -> str:
+    """Returns 'user.group' string for error messages."""
+    return pwd.getpwuid(uid).pw_name + "." + grp.getgrgid(gid).gr_name
+
+
+#
+# Shared read-only connections for the static status methods
+#
+_ro_connections = {}
+
+# sqlite3.OperationalError message prefix for a missing table
+_NO_SUCH_TABLE  = "no such table"
+
+def _ro_connection(filename: str) -> sqlite3.Connection:
+    """Returns a read-only connection to the database, opened on first use and shared by subsequent status queries. Status queries must not create or lock anything."""
+    db = _ro_connections.get(filename)
+    if db is None:
+        db = sqlite3.connect(
+            pathlib.Path(os.path.abspath(filename)).as_uri() + "?mode=ro",
+            uri = True
+        )
+        _ro_connections[filename] = db
+    return db
+
+@atexit.register
+def _ro_close():
+    for db in _ro_connections.values():
+        db.close()
+    _ro_connections.clear()
+
+
 class Database:
     # Class instance will have only '.connection' member.
     # If cursor is needed, it has to be created on-demand.
 
+    # UPSERT ("INSERT ... ON CONFLICT DO UPDATE") requires SQLite 3.24.0.
+    # Debian 9 ships with 3.16, which has to use UPDATE-then-INSERT.
+    HAS_UPSERT = sqlite3.sqlite_version_info >= (3, 24, 0)
+
+    # Columns that the 'psu' table must have
+    PSU_COLUMNS = frozenset((
+        "id", "power", "voltage_setting", "current_limit",
+        "measured_current", "measured_voltage", "modified"
+    ))
+
     class Command:
         def __init__(self, db):
             # Store the provided parent Database object instance
             self.db = db
 
-        def next(self) -> tuple:
-            """Return oldest unprocessed command, if any."""
-            sql = """
+        # Constant SQL text, so that the connection's statement cache
+        # (keyed by SQL text) always hits on the polling path.
+        #
+        # NOTE: next() and close() are deliberately separate statements.
+        # Claiming the command with "UPDATE ... RETURNING" would need
+        # SQLite 3.35 (Debian 9 has 3.16) and, worse, an UPDATE opens a
+        # write transaction even when nothing matches - at 10 Hz that would
+        # keep the middleware from inserting new commands. The plain SELECT
+        # takes no write lock and the daemon is the only consumer, so there
+        # is no race between next() and close() either.
+        SQL_NEXT = """
             SELECT      id,
                         command,
                         value
@@ -46,23 +128,28 @@ class Database:
             ORDER BY    created ASC
             LIMIT       1
             """
-            return self.db.connection.execute(sql).fetchone()
+        SQL_CLOSE = """
+            UPDATE      command
+            SET         result  = :result,
+                        handled = CURRENT_TIMESTAMP
+            WHERE       id      = :id
+            """
+
+        def next(self) -> sqlite3.Row:
+            """Return oldest unprocessed command (id, command, value), if any."""
+            return self.db._execute(self.SQL_NEXT).fetchone()
 
         def close(self, id: int, result: str):
             """Store command result and close command."""
+            sql = self.SQL_CLOSE
             try:
-                sql = """
-                UPDATE      command
-                SET         result  = :result,
-                            handled = CURRENT_TIMESTAMP
-                WHERE       id      = :id
-                """
-                self.db.connection.execute(sql, {"id": id, "result": result})
+                self.db._execute(sql, {"id": id, "result": result})
             except Exception as e:
-                self.db.connection.rollback()
+                self.db.rollback()
                 raise ValueError("ID: {}, SQL: {}".format(id, sql)) from None
             else:
-                self.db.connection.commit()
+                # Middleware is waiting for the result - do not delay it.
+                self.db.commit()
 
 
     class PSU:
@@ -70,30 +157,54 @@ class Database:
             # Store the provided parent Database object instance
             self.db = db
 
+        # Generated (insert, update) SQL, keyed by the set of column names.
+        # The daemon always updates the same columns, so in practice this
+        # holds one entry and the SQL is built only once.
+        # With UPSERT support, 'insert' is an upsert and 'update' is None.
+        _sql_cache = {}
+
         def update(self, values: dict):
-            try:
+            key = frozenset(values)
+            sql = self._sql_cache.get(key)
+            if sql is None:
                 insert = "INSERT INTO psu (id, {}) VALUES (0, {})".format(
-                    ",".join([k for k, _ in values.items()]),
-                    ",".join([":"+k for k, _ in values.items()])
+                    ",".join(values),
+                    ",".join(":" + k for k in values)
                 )
-                update = "UPDATE psu SET {} WHERE id = 0".format(
-                    ",".join([k+" = :"+k for k, _ in values.items()])
-                )
-                cursor = self.db.connection.cursor()
-                cursor.execute(update, values)
-                if cursor.rowcount != 1:
-                    cursor.execute(insert, values)
+                assignments = ",".join(k + " = :" + k for k in values)
+                update = "UPDATE psu SET {} WHERE id = 0".format(assignments)
+                if Database.HAS_UPSERT:
+                    insert += " ON CONFLICT (id) DO UPDATE SET {}".format(
+                        assignments
+                    )
+                    update = None
+                sql = self._sql_cache.setdefault(key, (insert, update))
+            insert, update = sql
+            # Each update commits at once: the write lock is not held
+            # between ticks (the middleware inserts commands) and readers
+            # see the new values immediately. With WAL and
+            # synchronous=NORMAL, a commit does not fsync.
+            try:
+                if update is None:
+                    # Single UPSERT statement, atomic in autocommit mode
+                    self.db._execute(insert, values)
+                else:
+                    # UPDATE, and INSERT if the row did not exist yet
+                    self.db.begin()
+                    if self.db._execute(update, values).rowcount != 1:
+                        self.db._execute(insert, values)
+                    self.db.commit()
             except Exception as e:
-                self.db.connection.rollback()
-                log.error(update)
-                log.error(values)
+                self.db.rollback()
+                log.error(
+                    "PSU update failed: %s (SQL: %s, values: %s)",
+                    e, update or insert, values
+                )
                 raise ValueError(
                     "values: {}, update SQL: {}, insert SQL: {}".format(
                         str(values), update, insert
                     )
                 ) from None
-            else:
-                self.db.connection.commit()
 
 
     #
@@ -104,27 +215,92 @@ class Database:
         self.command = self.Command(self)
         self.psu     = self.PSU(self)
 
-        self.connection = sqlite3.connect(filename, timeout=3)
+        # Cursors of the polling hot path, keyed by SQL text (see _execute())
+        self._cursors = {}
+
+        # Autocommit mode (isolation_level = None). The sqlite3 module does
+        # not inspect and implicitly BEGIN on statements; multi-statement
+        # updates open their transaction explicitly (see begin()).
+        self.connection = sqlite3.connect(
+            filename,
+            timeout             = 3,
+            isolation_level     = None,
+            cached_statements   = 64
+        )
+        # Rows can be accessed by index and by column name
+        self.connection.row_factory = sqlite3.Row
         self.connection.execute("PRAGMA foreign_keys = ON")
-        sql = "SELECT 1 FROM sqlite_master WHERE type='table' AND name='psu'"
-        if not self.connection.execute(sql).fetchall():
+        # WAL lets the middleware read while we write and with
+        # synchronous=NORMAL, commits no longer fsync each time.
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.execute("PRAGMA wal_autocheckpoint = 1000")
+        # Freed pages need not be overwritten with zeros
+        self.connection.execute("PRAGMA secure_delete = OFF")
+        # (cid, name, type, notnull, dflt_value, pk) for each column
+        columns = frozenset(
+            row[1] for row in self.connection.execute("PRAGMA table_info(psu)")
+        )
+        if not columns:
             raise ValueError("Table 'psu' does not exist!")
+        if not Database.PSU_COLUMNS <= columns:
+            raise ValueError(
+                "Table 'psu' is missing column(s): {}".format(
+                    ", ".join(sorted(Database.PSU_COLUMNS - columns))
+                )
+            )
+        # Command.next() is polled at 10 Hz. Partial index holds only the
+        # unhandled commands and lets it seek instead of scanning the table.
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_command_pending "
+            "ON command (interface, created) WHERE handled IS NULL"
+        )
+        self.connection.commit()
 
         # Register Decimal() adapters
         sqlite3.register_adapter(decimal.Decimal, Database.decimal2string)
         sqlite3.register_converter("decimal", Database.string2decimal)
 
 
+    def _execute(self, sql: str, parameters = ()) -> sqlite3.Cursor:
+        """Execute SQL on a cursor dedicated to that SQL text. Reusing the same cursor (and identical SQL text) lets sqlite3 reuse its prepared statement instead of parsing and finalizing it on every poll."""
+        cursor = self._cursors.get(sql)
+        if cursor is None:
+            cursor = self._cursors.setdefault(sql, self.connection.cursor())
+        return cursor.execute(sql, parameters)
+
+
+    def begin(self):
+        """Open a write transaction, unless one is already open."""
+        if not self.connection.in_transaction:
+            self.connection.execute("BEGIN IMMEDIATE")
+
+
+    def commit(self):
+        """Commit pending changes (if a transaction is open)."""
+        self.connection.commit()
+
+
+    def rollback(self):
+        """Roll back all pending changes."""
+        self.connection.rollback()
+
+
     def __enter__(self):
         return self
 
 
     def __exit__(self, exc_type, exc_value, traceback):
+        for cursor in self._cursors.values():
+            cursor.close()
+        self._cursors.clear()
         # Empty 'psu' table signals to the middleware that
         # the controller daemon is not running.
         # There is also no reason to keep old voltage/current data.
+        # Unconditional DELETE lets SQLite use its truncate optimization.
+        self.begin()
         self.connection.execute("DELETE FROM psu")
-        self.connection.commit()
+        self.commit()
         self.connection.close()
 
 
@@ -144,12 +320,13 @@ class Database:
         try:
             # The 'psu' table can have only zero or one rows.
             # Locked with primary key column value constraint.
+            # Fractional seconds: a healthy daemon's row is less than a
+            # second old, and a zero age would read as "no data".
             sql = """
-                SELECT (julianday('now') - julianday(modified)) * 86400
+                SELECT (julianday('now') - julianday(modified)) * 86400.0
                 FROM psu
                 """
-            with sqlite3.connect(filename) as db:
-                result = db.execute(sql).fetchone()
+            result = _ro_connection(filename).execute(sql).fetchone()
 
             if result:
                 return float(result[0])
@@ -172,28 +349,26 @@ class Database:
     @staticmethod
     def check_db_file(filename : str):
         """Check the specified database file and the directory it is located for access. Raises and exception if a problem is discovered, otherwise returns silently."""
-        import stat
-        import pwd
-        import grp
-
         # 1. File exists and it is a file
-        if not os.path.isfile(filename):
+        try:
+            file_stat = os.stat(filename)
+        except FileNotFoundError:
+            file_stat = None
+        if not file_stat or not stat.S_ISREG(file_stat.st_mode):
             raise ValueError(
                 "Database file '{}' does not exist?".format(filename)
             )
         # 2. File is owned by patemon.www-data
-        correct_owner = "patemon.www-data"
-        current_owner = \
-            pwd.getpwuid(os.stat(filename).st_uid).pw_name + "." + \
-            grp.getgrgid(os.stat(filename).st_gid).gr_name
-        if current_owner != correct_owner:
+        if (file_stat.st_uid, file_stat.st_gid) != _owner_ids():
+            correct_owner = _OWNER_USER + "." + _OWNER_GROUP
+            current_owner = _owner_name(file_stat.st_uid, file_stat.st_gid)
             raise ValueError(
                 "Database file '{}' has incorrect ownership ('{}', should be '{}')"
                 .format(filename, current_owner, correct_owner)
             )
         # 3. File permissions are 66x
         correct_permissions = 0o660
-        current_permissions = os.stat(filename)[stat.ST_MODE] & 0o770
+        current_permissions = file_stat.st_mode & 0o770
         if current_permissions != correct_permissions:
             raise ValueError(
                 "Database file '{}' has incorrect permissions ('{}', should be '{}')"
@@ -205,18 +380,17 @@ class Database:
             )
         # 4. Directory is owned by patemon.www-data (because temporary files)
         directory = os.path.dirname(filename)
-        correct_owner = "patemon.www-data"
-        current_owner = \
-            pwd.getpwuid(os.stat(directory).st_uid).pw_name + "." + \
-            grp.getgrgid(os.stat(directory).st_gid).gr_name
-        if current_owner != correct_owner:
+        directory_stat = os.stat(directory)
+        if (directory_stat.st_uid, directory_stat.st_gid) != _owner_ids():
+            correct_owner = _OWNER_USER + "." + _OWNER_GROUP
+            current_owner = _owner_name(directory_stat.st_uid, directory_stat.st_gid)
             raise ValueError(
                 "Database directory '{}' has incorrect ownership ('{}', should be '{}')"
                 .format(directory, current_owner, correct_owner)
             )
         # 5. Directory permissions are 77x
         correct_permissions = 0o770
-        current_permissions = os.stat(directory)[stat.ST_MODE] & 0o770
+        current_permissions = directory_stat.st_mode & 0o770
         if current_permissions != correct_permissions:
             raise ValueError(
                 "Database file '{}' has incorrect permissions ('{}', should be '{}')"
@@ -271,8 +445,8 @@ class Database:
 
     # filestatusstring() -> status_fileaccess_str()
     @staticmethod
-    def filestatusstring(filename: str) -> str:
-        t = Database.filestatus(filename)
+    def filestatusstring(filename: str, *, file_status: tuple = None) -> str:
+        t = file_status or Database.filestatus(filename)
         if not t[0]:
             return "file does not exist!"
         if not t[1] and not t[2]:
@@ -285,41 +459,49 @@ class Database:
 
 
     @staticmethod
-    def psutablestatus(filename: str) -> tuple:
-        """Returns tuple of boolean 'exists' values (psu_table, psu_row)."""
-        if not os.path.isfile(filename):
+    def psutablestatus(filename: str, *, file_status: tuple = None) -> tuple:
+        """Returns tuple of boolean 'exists' values (psu_table, psu_row). File access is checked only if the database cannot be opened or read; optional 'file_status' is a tuple from .filestatus(), if the caller already has one."""
+        try:
+            result = _ro_connection(filename).execute(
+                "SELECT * FROM psu"
+            ).fetchone()
+            if result:
+                return (True, True)
+            else:
+                return (True, False)
+        except sqlite3.OperationalError as e:
+            if str(e).startswith(_NO_SUCH_TABLE):
+                return (False, False)
+            error = e
+        # Unable to open or read the database - find out why
+        isfile, readable, writable = \
+            file_status or Database.filestatus(filename)
+        if not isfile:
             raise ValueError(
                 "Specifield database file '{}' does not exist!".format(
                     filename
                 )
             )
-        if not os.access(filename, os.R_OK):
+        if not readable:
             raise ValueError(
                 "Database file '{}' is not readable!".format(
                     filename
                 )
             )
-        if not os.access(filename, os.W_OK):
+        if not writable:
             raise ValueError(
                 "Database file '{}' is not writable!".format(
                     filename
                 )
             )
-        try:
-            with sqlite3.connect(filename) as db:
-                result = db.execute("SELECT * FROM psu").fetchone()
-            if result:
-                return (True, True)
-            else:
-                return (True, False)
-        except sqlite3.OperationalError as e:
-            if str(e)[:len("no such table")] == "no such table":
-                return (False, False)
+        raise ValueError(
+            "Database file '{}' query failed! ({})".format(filename, str(error))
+        )
 
 
     @staticmethod
-    def psutablestatusstring(filename: str) -> str:
-        t = Database.psutablestatus(filename)
+    def psutablestatusstring(filename: str, *, file_status: tuple = None) -> str:
+        t = Database.psutablestatus(filename, file_status = file_status)
         if not t[0]:
             return "table does not exist!"
         if not t[1]:
@@ -7,48 +7,75 @@
 #
 # IntervalScheduler.py - Jani Tammi <jasata@utu.fi>
 #   0.1     2018.11.14  Initial version.
+#   0.2     2026.10.15  Monotonic clock and a deadline heap.
+#   0.3     2026.10.15  Selectable catch-up behavior for late events.
+#   0.3.1   2026.10.15  .next() sleeps for .timeout().
 #
 #
 # Intervals for processing commands and for updating 'psu' table.
 #
+import math
 import time
+import heapq
 
 class IntervalScheduler():
     # Event flags
     COMMAND = 0x01
     UPDATE  = 0x02
 
-    class DotDict(dict):
-        """dot.notation access to dictionary attributes"""
-        __getattr__ = dict.get
-        __setattr__ = dict.__setitem__
-        __delattr__ = dict.__delitem__
-        def __missing__(self, key):
-            """Return None if non-existing key is accessed"""
-            return None
+    # Catch-up behavior, when an event is late by more than its interval
+    #   'burst'     Fire once for each missed deadline (one per .next()).
+    #   'skip'      Fire once and schedule the next one interval from now.
+    #   'phase'     Fire once and skip to the next deadline on the
+    #               original interval grid.
+    CATCHUP = ('burst', 'skip', 'phase')
+
+    class Event:
+        """Interval of a scheduled event"""
+        __slots__ = ('INTERVAL',)
+        def __init__(self, interval):
+            self.INTERVAL = interval
 
 
     def __init__(
         self,
         command_interval    = 0.1,
         update_interval     = 0.5,
-        time_window = 0.01
+        time_window = 0.01,
+        coalesce    = True,
+        catchup     = 'phase'
     ):
-        now = time.time()
-        self.Command                = self.DotDict()
-        self.Command.INTERVAL       = command_interval
-        self.Command.NEXTEVENT      = now + self.Command.INTERVAL
-        self.Update                 = self.DotDict()
-        self.Update.INTERVAL        = update_interval
-        self.Update.NEXTEVENT       = now + self.Update.INTERVAL
+        """Events that fall within 'time_window' of each other are returned together by .next(). With 'coalesce', such events are also aligned to the same deadline, so that they keep firing on the same wakeup. 'catchup' selects how late events are rescheduled (see IntervalScheduler.CATCHUP)."""
+        if catchup not in self.CATCHUP:
+            raise ValueError(
+                "Unsupported catchup '{}' (valid: {})".format(
+                    catchup, ", ".join(self.CATCHUP)
+                )
+            )
+        self.Command                = self.Event(command_interval)
+        self.Update                 = self.Event(update_interval)
         self.time_window            = time_window
+        self.coalesce               = coalesce
+        self.catchup                = catchup
+        # Event flag -> event
+        self._events = {
+            self.COMMAND    : self.Command,
+            self.UPDATE     : self.Update
+        }
+        # Heap of [deadline, event flag], earliest deadline first.
+        # Deadlines are time.monotonic() values (immune to clock changes).
+        self._heap = []
+        self.restart()
 
 
     def restart(self):
-        """Simply reset .NEXTEVENT timestamps"""
-        now = time.time()
-        self.Command.NEXTEVENT  = now + self.Command.INTERVAL
-        self.Update.NEXTEVENT   = now + self.Update.INTERVAL
+        """Simply reset event deadlines"""
+        now = time.monotonic()
+        self._heap = [
+            [now + event.INTERVAL, flag]
+            for flag, event in self._events.items()
+        ]
+        heapq.heapify(self._heap)
 
 
     def update(self, interval = None):
@@ -58,32 +85,63 @@ class IntervalScheduler():
         return self.Update.INTERVAL
 
 
+    def timeout(self):
+        """Seconds until the next event (zero if already due). For an outer event loop that wants to wait on something else (select(), etc.) instead of letting .next() sleep."""
+        return max(0.0, self._heap[0][0] - time.monotonic())
+
+
     def next(self):
         """Sleep until next event(s) and return them as flags"""
-        now = time.time()
-        # next event is the one with smallest triggering time
-        next_event = min(
-            self.Command.NEXTEVENT,
-            self.Update.NEXTEVENT
-        )
-        # Sleep until next triggered event (skip negative duration)
-        sleep_duration = next_event - now
+        heap = self._heap
+        # Sleep until next triggered event (zero, if already due)
+        sleep_duration = self.timeout()
         if sleep_duration > 0:
             time.sleep(sleep_duration)
         # trigger_time is the time *before* which events are triggered
-        trigger_time = now + self.time_window
+        trigger_time = time.monotonic() + self.time_window
         events = 0x00
-        # Compile fields and reschedule events that fired
-        if self.Command.NEXTEVENT < trigger_time:
-            events |= self.COMMAND
-            self.Command.NEXTEVENT += self.Command.INTERVAL
-        if self.Update.NEXTEVENT < trigger_time:
-            events |= self.UPDATE
-            self.Update.NEXTEVENT += self.Update.INTERVAL
+        fired = []
+        # Compile fields from events that fired
+        while heap and heap[0][0] < trigger_time:
+            deadline, flag = heapq.heappop(heap)
+            events |= flag
+            fired.append((deadline, flag))
+        # Reschedule them (each fires at most once per call)
+        intervals = self._events
+        for deadline, flag in fired:
+            heapq.heappush(
+                heap,
+                [
+                    self._advance(
+                        deadline,
+                        intervals[flag].INTERVAL,
+                        trigger_time
+                    ),
+                    flag
+                ]
+            )
+        # Align deadlines that are (nearly) the same to a single wakeup
+        if self.coalesce:
+            earliest = heap[0][0]
+            for entry in heap:
+                if entry[0] - earliest <= self.time_window:
+                    entry[0] = earliest
+            heapq.heapify(heap)
 
         return events
 
 
+    def _advance(self, deadline, interval, now):
+        """Next deadline for an event that fired at 'deadline', according to the catch-up behavior."""
+        deadline += interval
+        if deadline >= now or self.catchup == 'burst':
+            return deadline
+        if self.catchup == 'skip':
+            return now + interval
+        # 'phase' - next point on the original grid after 'now'
+        return deadline + math.ceil((now - deadline) / interval) * interval
+
+
     def __enter__(self):
         return self
 
@@ -8,15 +8,23 @@
 # main.py - Jani Tammi <jasata@utu.fi>
 #   0.1.0   2018.11.15  Initial version.
 #   0.2.0   2018.11.18  Static status methods added.
+#   0.2.1   2026.10.15  PID written after truncating the locked file.
+#                       lockfilestatus() tests the lock with F_GETLK.
 #
 #
 # Provide a combined lock/PID file for user space daemon.
 #
+# One lock file per daemon, locked once at start-up and held until exit.
+# The lock is taken exactly once per process lifetime, so there is no lock
+# contention to optimize (e.g. byte-range locks on a shared file). Other
+# tools read the PID from this file, which would not work with range locks.
+#
 import os
 import sys
 import time
 import fcntl
 import errno
+import struct
 
 
 class Lockfile:
@@ -32,26 +40,32 @@ class Lockfile:
     def __init__(self, name: str):
         """Create a lock file and write current PID into it."""
         self.name = name
+        # Open existing or create, do not truncate before we hold the lock
+        # (not following a symlink planted in a shared lock directory)
+        self.fd = os.open(
+            self.name,
+            os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW,
+            0o644
+        )
         try:
-            try:
-                self.fd = open(self.name, 'r+') # Open existing, do not tuncate
-            except FileNotFoundError:
-                self.fd = open(self.name, 'w+') # Create and truncate
             # Get an exclusive lock. Fails if another process has the files locked.
             fcntl.lockf(self.fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
-            # Record the process id to pid and lock files.
-            self.fd.write("{}".format(os.getpid()))
-            self.fd.flush()
         except BlockingIOError as e:
             if e.errno == errno.EAGAIN:
                 # Action failed due to locking
-                pid = self.fd.readline()
+                pid = os.pread(self.fd, 32, 0).decode('ascii', 'replace')
+                os.close(self.fd)
                 raise Lockfile.AlreadyRunning(
-                    pid or "unknown",
+                    pid.strip() or "unknown",
                     "Another process already running!"
                 ) from None
-        except Exception as e:
+            os.close(self.fd)
             raise
+        # Record the process id. Truncate first, so that a longer PID of an
+        # earlier run cannot leave trailing digits behind.
+        os.ftruncate(self.fd, 0)
+        os.write(self.fd, "{}\n".format(os.getpid()).encode('ascii'))
+        os.fsync(self.fd)
 
 
     def touch(self):
@@ -70,26 +84,29 @@ class Lockfile:
         except OSError as e:
             if e.errno != errno.ENOENT:
                 raise
+        finally:
+            # Releases the lock
+            os.close(self.fd)
 
 
     @staticmethod
     def lockfilestatus(filename: str) -> tuple:
-        """Checks if lock file exists and if the file is locked. (exists, locked). NOTE: Can also raise PermissionError (13), if the daemon has been started as another user (or super user). This condition is to be handled by the caller."""
-        if not os.path.isfile(filename):
+        """Checks if lock file exists and if the file is locked. (exists, locked). The lock is only tested (F_GETLK), never acquired, and the file is never created. NOTE: Can also raise PermissionError (13), if the file is not readable for the current user. This condition is to be handled by the caller."""
+        try:
+            # Do not follow symlinks - lock directory may be /tmp
+            fd = os.open(filename, os.O_RDONLY | os.O_NOFOLLOW)
+        except FileNotFoundError:
             return (False, False)
-        # Exists - test for a lock
         try:
-            fd = open(filename, 'a')
-            fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
-        except BlockingIOError as e:
-            if e.errno == errno.EAGAIN:
-                return (True, True)
+            # struct flock: l_type, l_whence, l_start, l_len (0 = whole file),
+            # l_pid. Kernel replaces l_type with F_UNLCK if nothing would
+            # block a write lock.
+            flock = struct.pack('hhqqi', fcntl.F_WRLCK, os.SEEK_SET, 0, 0, 0)
+            flock = fcntl.fcntl(fd, fcntl.F_GETLK, flock)
+            lock_type = struct.unpack('hhqqi', flock)[0]
         finally:
-            try:
-                fd.close()
-            except:
-                pass
-        return (True, False)
+            os.close(fd)
+        return (True, lock_type != fcntl.F_UNLCK)
 
 
     @staticmethod
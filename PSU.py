@@ -8,6 +8,20 @@
 #                       Added hardcoded long delays after such commands.
 #   0.4     2019.06.12  Syslogging now a static class method of PSU.
 #   0.4.1   2019.06.12  Logging now provided by log.py.
+#   0.5     2026.10.15  Replies read with poll() and os.readv(), deadline
+#                       bounded. No recovery delays, 1 ms DSR polling.
+#                       Compound SCPI messages (capability probed).
+#                       .values: measurements in one round-trip, settings
+#                       re-read periodically. Settings cached, .refresh().
+#                       .power is a bool ("ON"/"OFF" only in .values).
+#                       Init: one setup message, one verification query.
+#                       Connect-time version query retried with backoff.
+#                       Serial I/O serialized with a per-instance lock.
+#                       Low latency mode for USB serial adapters.
+#                       .status reads the output's ISUM register.
+#                       Measure.voltage_and_current(), float accessors.
+#   0.5.1   2026.10.15  .find(): parallel probes, found port remembered
+#                       in a private file, exclusive with pySerial 3.3+.
 #
 #
 # This class interface uses typing (Python 3.5+) for public methods.
@@ -100,7 +114,31 @@
 #       TLDR; our first USB/RS-232 adapter caused the remaining issues.
 #       A borrowed unit solved the issues.
 #
+###############################################################################
+#
+# NO BACKGROUND SERIAL I/O
+#
+#       All serial I/O is done synchronously by the calling thread. The
+#       E3631 handles one message at a time (it holds DTR low until its
+#       reply has been read), so a reader thread could not have more than
+#       one request in flight anyway. The daemon main loop (control.py) has
+#       nothing to do while waiting - the database write needs the reply -
+#       so there is no work to overlap with the UART wait. Serial round-trips
+#       are reduced by batching queries into compound SCPI messages instead.
+#       A PSU instance may still be shared by threads; its serial I/O is
+#       serialized with a per-instance lock.
+#
+#       For the same reason, replies are read right after each query rather
+#       than drained from a non-blocking fd at the end of a scheduler tick:
+#       with one reply in flight there is nothing to collect in one read,
+#       and a compound query already returns several values in one line.
+#
+import os
+import re
 import time
+import threading
+import collections
+import select
 import serial
 import decimal
 
@@ -115,14 +153,106 @@ from Config import Config
 
 class PSU:
 
-    _loops = 0
-    _last_read = ""
-    _transaction_log = []
+    # Fixed set of instance attributes (no per-instance __dict__)
+    __slots__ = (
+        'measure',
+        'port',
+        '_fd',
+        '_poll',
+        '_rxview',
+        '_compound',
+        '_power',
+        '_voltage',
+        '_current_limit',
+        '_values_count',
+        '_last_read',
+        '_transaction_log',
+        '_io_lock'
+    )
+
+    # Port where .find() last detected the PSU (tried first by .find())
+    _found_at = None
+    # Seconds .find() waits for a port to reply (ports are probed in
+    # parallel, so this is also roughly the total time of a search)
+    PROBE_TIMEOUT = 0.3
+    # Version query attempts at connect, and the first retry delay in
+    # seconds (doubled for each retry: 50, 100, 200 ms)
+    VERSION_ATTEMPTS    = 4
+    VERSION_RETRY_DELAY = 0.05
+    # Probes open ports with exclusive access, if pySerial supports it
+    # ('exclusive' is new in pySerial 3.3, Debian 9 ships 3.2.1)
+    PROBE_OPTIONS = {"exclusive": True} if tuple(
+        int(n) for n in re.findall(r"\d+", serial.VERSION)[:2]
+    ) >= (3, 3) else {}
+    # Serial port list (monotonic time, ports) shared by .find() calls
+    # within PORTS_TTL seconds (enumeration walks /sys/class/tty)
+    _ports = (None, [])
+    PORTS_TTL = 2.0
+
+    # Agilent uses CRLF line termination
+    CRLF    = b'\r\n'
+
+    # Pre-encoded setter commands ("%.3f" formatting is done by bytes.__mod__)
+    # "OUTP:STAT ON|OFF" == "OUTP ON|OFF", indexed with bool
+    SET_OUTPUT          = (b'OUTP OFF', b'OUTP ON')
+    # "SOUR:VOLT:IMM" == "VOLT"
+    SET_VOLTAGE         = b'VOLT %.3f'
+    # "SOUR:CURR:IMM" == "CURR"
+    SET_CURRENT_LIMIT   = b'CURR %.3f'
+    SET_REMOTE          = b'SYST:REM'
+
+    # Pre-encoded queries
+    GET_VERSION         = b'SYST:VERS?'
+    GET_ERROR           = b'SYST:ERR?'
+    # "INST:SEL?" == "INST?"
+    GET_TERMINAL        = b'INST?'
+    # "OUTP:STAT?" == "OUTP?", return value is string "0" or "1"
+    GET_OUTPUT          = b'OUTP?'
+    GET_VOLTAGE         = b'SOUR:VOLT:IMM?'
+    # "SOUR:CURR:IMM?" == "CURR?"
+    GET_CURRENT_LIMIT   = b'SOUR:CURR:IMM?'
+    # Questionable Instrument Summary register of output <n> (see ISUM)
+    GET_STATUS          = b'STAT:QUES:INST:ISUM%d:COND?'
+    # "MEAS:VOLT? P6V" <- use this! ("MEAS?" is OK!)
+    MEAS_VOLTAGE        = b'MEAS?'
+    # "MEAS:CURR? P6V"
+    MEAS_CURRENT        = b'MEAS:CURR?'
+
+    # E3631A User's Guide, "The SCPI Status Registers": on the triple
+    # output E3631A, the Questionable Status register only summarizes the
+    # outputs (ISUM1..3, bits 11-13). Regulation mode is reported by each
+    # output's Questionable Instrument Summary register, where bit 0
+    # ("Voltage") is set when the output is in constant current mode
+    # (current limit reached). (Bit 0 of the Questionable Status register
+    # itself is the single output E3632A/E3633A layout.)
+    ISUM = {"P6V": 1, "P25V": 2, "N25V": 3}
+    CC_MODE_BIT = 0
+
+    # SYST:VERS? response ('yyyy.x', for example "1995.0")
+    FIRMWARE_VERSION = re.compile(r"\d{4}\.\d")
+    # APPL? response is a quoted string: "<voltage>,<current>"
+    APPLIED = re.compile(r'"([^",]+),([^",]+)"')
+
+    # Baud rates supported by the E3631 RS-232 interface. 9600 is the
+    # fastest and relies on the DTR/DSR handshake, which is always enabled
+    # (dsrdtr = True).
+    BAUDRATES = (300, 600, 1200, 2400, 4800, 9600)
+
+    # .values re-reads the settings from the PSU on every N'th call. The
+    # front panel is locked in remote mode (SYST:REM), so the settings
+    # change only through this class, unless someone presses "Local".
+    # Skipping them saves over half of the bytes sent and received.
+    SETTINGS_REFRESH = 10
+
+    # Seconds between DSR checks while waiting for a reply (or for DTR)
+    DSR_POLL = 0.001
+
+    # Seconds to wait for DTR before sending, unless given per transaction
+    DTR_TIMEOUT = 0.5
     #
-    # Object properties
+    # Object properties (see __slots__)
     #
-    # instance of serial.Serial (public)
-    port    = None
+    # .port     instance of serial.Serial (public), set by __init__()
 
     #
     # static properties for syslogging (see .syslog() )
@@ -135,95 +265,211 @@ class PSU:
     # Public interface
     #
     # Available via nested class as functions:
-    #       PSU().measure.voltage()     float
-    #       PSU().measure.current()     float
+    #       PSU().measure.voltage()     Decimal
+    #       PSU().measure.current()     Decimal
+    #       PSU().measure.voltage_f()   float
+    #       PSU().measure.current_f()   float
+    #       PSU().measure.voltage_and_current()
+    #                                   tuple
     # PSU properties:
-    #       PSU().power                 bool
-    #       PSU().voltage               float
-    #       PSU().current_limit         float
+    #       PSU().power                 bool            (cached setting)
+    #       PSU().power_actual          bool            (read from PSU)
+    #       PSU().voltage               float           (cached setting)
+    #       PSU().voltage_actual        float           (read from PSU)
+    #       PSU().current_limit         float           (cached setting)
+    #       PSU().current_limit_actual  float           (read from PSU)
+    #       PSU().status                str             ["OK" | "OVER CURRENT"]
     #       PSU().port                  serial.Serial
     # PSU functions:
     #       PSU().values_tuple()        tuple
+    #       PSU().refresh()             None            (re-read settings)
     #       PSU.find()                  str             ["/dev/.." | None]
     #
     class Measure:
         """PSU.Measure - nested class providing beautified naming for measurement functions."""
+        __slots__ = ('psu', '_transact', '_transact_many')
         def __init__(self, psu):
             self.psu = psu
+            # Bound once, instead of looking up the mangled names per call
+            self._transact      = psu._PSU__transact
+            self._transact_many = psu._PSU__transact_many
 
 
         def voltage(self) -> decimal.Decimal:
             """Read measured voltage from the device."""
-            # "SOUR:VOLT:IMM?" vs "MEAS:VOLT? P6V" <- use this! ("MEAS?" is OK!)
-            return decimal.Decimal(self.psu._PSU__transact("MEAS?"))
+            # "SOUR:VOLT:IMM?" vs "MEAS:VOLT? P6V"
+            return decimal.Decimal(self._transact(PSU.MEAS_VOLTAGE))
 
 
         def current(self) -> decimal.Decimal:
             """Read measured current from the device."""
-            # "MEAS:CURR? P6V"
-            return decimal.Decimal(self.psu._PSU__transact("MEAS:CURR?"))
+            return decimal.Decimal(self._transact(PSU.MEAS_CURRENT))
+
+
+        def voltage_f(self) -> float:
+            """Read measured voltage from the device as a float. For callers that do not need exact decimal values (plotting, logging)."""
+            return float(self._transact(PSU.MEAS_VOLTAGE))
+
+
+        def current_f(self) -> float:
+            """Read measured current from the device as a float."""
+            return float(self._transact(PSU.MEAS_CURRENT))
+
+
+        def voltage_and_current(self) -> tuple:
+            """Read measured voltage and current with a single compound query (one serial round-trip). Use this instead of back-to-back .voltage() and .current() calls."""
+            return tuple(
+                decimal.Decimal(value)
+                for value in self._transact_many(
+                    PSU.MEAS_VOLTAGE,
+                    PSU.MEAS_CURRENT
+                )
+            )
 
 
     @property
     def power(self) -> bool:
-        """Read PSU power state ("ON" or "OFF")."""
-        # "OUTP:STAT?" == "OUTP?", return value is string "0" or "1"
-        return ("OFF", "ON")[self.__transact("OUTP?") == "1"]
+        """PSU power (output) state, True if ON. Returns the last written (or read) state without a serial round-trip, if known. Use .power_actual to read it from the PSU."""
+        if self._power is None:
+            return self.power_actual
+        return self._power
 
 
     @power.setter
     def power(self, value: bool) -> bool:
-        """Toggle power output ON or OFF."""
-        # "OUTP:STAT ON|OFF" == "OUTP ON|OFF"
-        self.__write("OUTP " + ("OFF", "ON")[value])
-        # After setting output state, PSU needs recovery time
-        # (the DTR signal is a lie! Try it!)
-        #time.sleep(__RECOVERY_DELAY__)
-        if self.power != ("OFF", "ON")[value]:
-            raise ValueError("Failed to toggle output ON/OFF!")
+        """Toggle power output ON or OFF. The new state is not read back here; the next .values call (or .refresh()) reports, if the PSU disagrees with it."""
+        self._power = None
+        self.__write(self.SET_OUTPUT[bool(value)])
+        # No recovery sleep (or *OPC? round-trip) here: the next command
+        # waits for the PSU to raise DTR, and the PSU executes commands in
+        # the order received.
+        self._power = bool(value)
+        # Verify with the next .values call (settings are read along with
+        # the measurements, in the same round-trip)
+        self._values_count = self.SETTINGS_REFRESH - 1
+
+
+    @property
+    def power_actual(self) -> bool:
+        """Read PSU power state from the device."""
+        self._power = self.__transact(self.GET_OUTPUT) == "1"
+        return self._power
 
 
     @property
     def voltage(self) -> decimal.Decimal:
-        """Read PSU voltage setting. NOT the same as measured voltage!"""
-        return decimal.Decimal(self.__transact("SOUR:VOLT:IMM?"))
+        """PSU voltage setting. NOT the same as measured voltage! Returns the last written (or read) setting without a serial round-trip, if known. Use .voltage_actual to read it from the PSU."""
+        if self._voltage is None:
+            return self.voltage_actual
+        return self._voltage
 
 
     @voltage.setter
     def voltage(self, value: Union[float, decimal.Decimal]):
-        """Set PSU voltage. After setting the value, the setting read back
-        and returned. NOTE: This is NOT the measured actual output voltage!"""
-        # "SOUR:VOLT:IMM" == "VOLT"
-        self.__write("VOLT {}".format(str(round(value, 3))))
+        """Set PSU voltage. NOTE: This is NOT the measured actual output voltage!"""
+        self._voltage = None
+        self.__write(self.SET_VOLTAGE % value)
+        self._voltage = decimal.Decimal("%.3f" % value)
+
+
+    @property
+    def voltage_actual(self) -> decimal.Decimal:
+        """Read PSU voltage setting from the device."""
+        self._voltage = decimal.Decimal(self.__transact(self.GET_VOLTAGE))
+        return self._voltage
 
 
     @property
     def current_limit(self) -> decimal.Decimal:
-        """Read PSU current limit setting."""
-        # "SOUR:CURR:IMM?" == "CURR?"
-        return decimal.Decimal(self.__transact("CURR?"))
+        """PSU current limit setting. Returns the last written (or read) setting without a serial round-trip, if known. Use .current_limit_actual to read it from the PSU."""
+        if self._current_limit is None:
+            return self.current_limit_actual
+        return self._current_limit
 
 
     @current_limit.setter
     def current_limit(self, value: Union[float, decimal.Decimal]):
         """Set PSU current limit value."""
-        # "SOUR:CURR:IMM" == "CURR"
-        self.__write("CURR {}".format(str(round(value, 3))))
-        # After setting current limit, PSU needs recovery time
-        #time.sleep(__RECOVERY_DELAY__)
-        # Skip verification for now...
+        self._current_limit = None
+        self.__write(self.SET_CURRENT_LIMIT % value)
+        # Verified by .refresh() or every SETTINGS_REFRESH'th .values call
+        self._current_limit = decimal.Decimal("%.3f" % value)
+
+
+    @property
+    def current_limit_actual(self) -> decimal.Decimal:
+        """Read PSU current limit setting from the device."""
+        self._current_limit = decimal.Decimal(
+            self.__transact(self.GET_CURRENT_LIMIT)
+        )
+        return self._current_limit
+
+
+    @property
+    def status(self) -> str:
+        """Read output regulation status ("OK" or "OVER CURRENT") of the configured terminal. Output is current limited when it is regulating in constant current mode, which the PSU reports in the output's Questionable Instrument Summary register."""
+        condition = int(
+            self.__transact(
+                self.GET_STATUS % self.ISUM[Config.PSU.Default.terminal]
+            )
+        )
+        return ("OK", "OVER CURRENT")[(condition >> self.CC_MODE_BIT) & 1]
 
 
     @property
     def values(self) -> dict:
-        """Returns a tuple for SQL INSERT."""
-        return dict({
-            "power"               :"ON" if self.power else "OFF",
-            "voltage_setting"     :self.voltage,
-            "current_limit"       :self.current_limit,
-            "measured_current"    :self.measure.current(),
-            "measured_voltage"    :self.measure.voltage()
-        })
+        """Returns a dictionary for SQL INSERT. Values are read with a single compound SCPI query (one serial round-trip). Settings are taken from the last known values and re-read from the PSU only on every SETTINGS_REFRESH'th call (or when not known)."""
+        self._values_count = (self._values_count + 1) % self.SETTINGS_REFRESH
+        if self._values_count == 0 or None in (
+            self._power, self._voltage, self._current_limit
+        ):
+            power, voltage, current_limit, current, volts = \
+                self.__transact_many(
+                    self.GET_OUTPUT,
+                    self.GET_VOLTAGE,
+                    self.GET_CURRENT_LIMIT,
+                    self.MEAS_CURRENT,
+                    self.MEAS_VOLTAGE
+                )
+            self.__update_settings(power, voltage, current_limit)
+        else:
+            current, volts = self.__transact_many(
+                self.MEAS_CURRENT,
+                self.MEAS_VOLTAGE
+            )
+        return {
+            "power"               :"ON" if self._power else "OFF",
+            "voltage_setting"     :self._voltage,
+            "current_limit"       :self._current_limit,
+            "measured_current"    :decimal.Decimal(current),
+            "measured_voltage"    :decimal.Decimal(volts)
+        }
+
+
+    def refresh(self):
+        """Read power state, voltage and current limit settings from the PSU (one serial round-trip), replacing the last known values."""
+        self.__update_settings(
+            *self.__transact_many(
+                self.GET_OUTPUT,
+                self.GET_VOLTAGE,
+                self.GET_CURRENT_LIMIT
+            )
+        )
+
+
+    def __update_settings(self, power: str, voltage: str, current_limit: str):
+        """Store settings read from the PSU as the last known values. Keeps the caches in sync with front panel changes and reports output state that differs from the last one set."""
+        power = power == "1"
+        if self._power is not None and self._power != power:
+            log.warning(
+                "PSU output is {}, expected {}!".format(
+                    "ON" if power else "OFF",
+                    "ON" if self._power else "OFF"
+                )
+            )
+        self._power         = power
+        self._voltage       = decimal.Decimal(voltage)
+        self._current_limit = decimal.Decimal(current_limit)
 
 
     ###########################################################################
@@ -244,55 +490,139 @@ class PSU:
                     "Response string: '{}'".format(line.decode('utf-8'))
                 )
             return line.decode('utf-8')
-        def found_at(port: str) -> bool:
+        def found_at(device: str) -> bool:
             """Guaranteed to return True or False, depending on if the PSU is detected at the provided port."""
-            def valid_firmware_string(firmware: str) -> bool:
-                """Validate 'yyyy.x' version string. Returns True is meets criteria, False if not."""
-                try:
-                    if len(firmware) < len("yyyy.x"):
-                        raise ValueError()
-                    if firmware[4:5] != '.':
-                        raise ValueError()
-                    int(firmware[0:4])
-                    int(firmware[5:6])
-                except:
-                    return False
-                return True
-            result = None
             try:
-                port = serial.Serial(
-                    port          = port,
+                # Exclusive (where available), so that a port in use by
+                # someone else is not disturbed by the probe
+                with serial.Serial(
+                    port          = device,
                     baudrate      = Config.PSU.Serial.baudrate,
                     parity        = Config.PSU.Serial.parity,
                     stopbits      = Config.PSU.Serial.stopbits,
                     bytesize      = Config.PSU.Serial.bytesize,
-                    timeout       = 0.3,
-                    write_timeout = None
-                )
-                PSU.flush(port)
-                # Agilent uses CRLF line termination
-                response = transact(port, 'System:Version?\r\n')
-                log.debug("response: '{}'".format(response))
-                result = valid_firmware_string(response)
+                    timeout       = PSU.PROBE_TIMEOUT,
+                    write_timeout = None,
+                    **PSU.PROBE_OPTIONS
+                ) as port:
+                    PSU.flush(port)
+                    # Agilent uses CRLF line termination
+                    response = transact(port, 'System:Version?\r\n')
+                    log.debug("response: '%s'", response)
+                    return PSU.valid_firmware_string(response)
             except Exception as e:
                 log.debug("Exception: " + str(e))
-                result = False
-            finally:
-                try:
-                    port.close()
-                except:
-                    pass
-            return result or False
+                return False
+        def load_found() -> tuple:
+            """Returns (device, hwid) remembered by an earlier process, or (None, None). Only a regular file owned by this user and not writable by others is accepted."""
+            try:
+                # Never follow a symlink, not even in the private directory
+                fd = os.open(found_file, os.O_RDONLY | os.O_NOFOLLOW)
+                with os.fdopen(fd, "r") as file:
+                    st = os.fstat(file.fileno())
+                    if st.st_uid != os.geteuid() or st.st_mode & 0o022:
+                        log.warning(
+                            "Ignoring '%s' (not owned by us, or writable by others)",
+                            found_file
+                        )
+                        return None, None
+                    device, hwid = (file.read(512).split("\n") + [""])[:2]
+                return device or None, hwid or None
+            except (OSError, ValueError):
+                return None, None
+        def save_found(device: str, hwid: str) -> None:
+            """Remember the found device and its adapter's hardware ID for the next process, in a private (0700) directory. Failure is not an error."""
+            try:
+                os.makedirs(os.path.dirname(found_file), 0o700, exist_ok = True)
+                fd = os.open(
+                    found_file,
+                    os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_NOFOLLOW,
+                    0o600
+                )
+                with os.fdopen(fd, "w") as file:
+                    file.write("{}\n{}".format(device, hwid or ""))
+            except OSError as e:
+                log.debug("Unable to save found port: " + str(e))
         #
         # PSU.find() block begins
         #
-        import serial.tools.list_ports
-        for sysfsobj in serial.tools.list_ports.comports():
-            log.info("Trying {}...".format(sysfsobj.device))
-            if found_at(sysfsobj.device):
-                return sysfsobj.device
+        # Previously detected port is probed alone, without enumeration.
+        # (USB/RS-232 adapters carry the adapter's VID/PID, not the PSU's,
+        # so the port list cannot be filtered by vendor)
+        # NOTE: 'import serial.tools...' would make 'serial' a local name of
+        #       .find() and unbound in found_at() until the import.
+        if PSU._found_at and found_at(PSU._found_at):
+            return PSU._found_at
+        from serial.tools import list_ports
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        listed, ports = PSU._ports
+        if listed is None or time.monotonic() - listed >= PSU.PORTS_TTL:
+            ports = list_ports.comports()
+            PSU._ports = (time.monotonic(), ports)
+        probed = PSU._found_at
+        # Port found by an earlier process. The adapter's hardware ID
+        # (VID:PID, serial number) follows it if ttyUSB numbering changed.
+        found_file = os.path.expanduser(Config.PSU.Serial.found_file or "")
+        if not probed and found_file:
+            device, hwid = load_found()
+            for p in ports:
+                if hwid and hwid != "n/a" and p.hwid == hwid:
+                    device = p.device
+                    break
+            if device in (p.device for p in ports):
+                if found_at(device):
+                    PSU._found_at = device
+                    return device
+                probed = device
+        devices = [p.device for p in ports if p.device != probed]
+        PSU._found_at = None
+        if not devices:
+            return None
+        # Probe all ports at once - each probe mostly waits for a reply
+        log.info("Trying {}...".format(", ".join(devices)))
+        with ThreadPoolExecutor(max_workers = min(len(devices), 8)) as pool:
+            probes = {pool.submit(found_at, d): d for d in devices}
+            for probe in as_completed(probes):
+                if probe.result():
+                    # Not yet started probes are not needed anymore
+                    for other in probes:
+                        other.cancel()
+                    PSU._found_at = probes[probe]
+                    if found_file:
+                        save_found(
+                            PSU._found_at,
+                            next(
+                                (p.hwid for p in ports
+                                 if p.device == PSU._found_at),
+                                None
+                            )
+                        )
+                    return PSU._found_at
         return None
 
+    @staticmethod
+    def valid_firmware_string(firmware: str) -> bool:
+        """Validate 'yyyy.x' version string. Returns True is meets criteria, False if not."""
+        return PSU.FIRMWARE_VERSION.match(firmware) is not None
+
+
+    # Only for the port .__init__() opens. .find() probes must not leave
+    # the driver state of unrelated serial devices changed.
+    @staticmethod
+    def low_latency(port: serial.Serial) -> bool:
+        """Set ASYNC_LOW_LATENCY on the serial device (Linux TIOCSSERIAL). For USB serial adapters (FTDI), this drops the 16 ms latency timer that otherwise delays every short SCPI response. Returns False, if the device (or platform) does not support it."""
+        try:
+            port.set_low_latency_mode(True)
+        except (AttributeError, ValueError, OSError) as e:
+            log.debug(
+                "Low latency mode not available for '%s' (%s)",
+                port.port,
+                e
+            )
+            return False
+        return True
+
+
     # Must be static method, because this method has be be usable
     # before the class is instantiated. Specifically, by the static
     # .find() -method
@@ -300,34 +630,38 @@ class PSU:
     def flush(port: serial.Serial):
         """Clear serial line/buffers from artefacts. Agilent E3631 User's Guide (p. 59) tells us that sending CTRL-C to the unit will cause it to discard any pending output. ("^C" ETX; "End of Text", 0x03 or b'\x03'). Quite: "For the <Ctrl-C> character to be recognized reliably by the power supply while it holds DTR FALSE, the bus controller must first set DSR FALSE. (NOTE: for us, in PySerial, this means setting _our_ DTR low)."""
         discard_timeout = 0.1
-        log.debug("#1 DSR: {} DTR: {}".format(port.dsr, port.dtr))
+        trace = log.debug_enabled()
+        def state(step: int):
+            """Log modem lines, only if debugging (each read is an ioctl)."""
+            if trace:
+                log.debug("#%d DSR: %s DTR: %s", step, port.dsr, port.dtr)
+        state(1)
         port.flushOutput()
-        log.debug("#2 DSR: {} DTR: {}".format(port.dsr, port.dtr))
+        state(2)
         port.flushInput()
-        log.debug("#3 DSR: {} DTR: {}".format(port.dsr, port.dtr))
+        state(3)
         time.sleep(0.1)
-        log.debug("#4 DSR: {} DTR: {}".format(port.dsr, port.dtr))
+        state(4)
         port.dtr = False
-        log.debug("#5 DSR: {} DTR: {}".format(port.dsr, port.dtr))
+        state(5)
         port.write(b'\x03')
-        log.debug("#6 DSR: {} DTR: {}".format(port.dsr, port.dtr))
+        state(6)
         port.dtr = True
-        log.debug("#7 DSR: {} DTR: {}".format(port.dsr, port.dtr))
+        state(7)
         # wait until unit raises DTR
         start = time.monotonic()
         while not port.dsr and time.monotonic() - start < discard_timeout:
-            time.sleep(0.01)
-        log.debug("#8 DSR: {} DTR: {}".format(port.dsr, port.dtr))
+            time.sleep(PSU.DSR_POLL)
+        state(8)
         if not port.dsr:
             raise serial.SerialTimeoutException(
                 "Device did not raise DTR within {:1.2f} ms".format(
                     discard_timeout * 1000
                 )
             )
-        # DTR has come up, but its a lie - PSU is not ready!
-        # Wait for magical period
-        #time.sleep(__RECOVERY_DELAY__)
-        # log.debug("#7", port.dsr, port.dtr)
+        # No recovery delay here: .__init__() retries its first query (with
+        # a bounded backoff) until the reply is valid, and .find() probes
+        # treat an invalid reply as "not found".
 
 
     ###########################################################################
@@ -343,12 +677,42 @@ class PSU:
         # Instantiate .measure member
         self.measure = self.Measure(self)
 
-        # Read and convert Config.py's float values into decimal.Decimal
-        # TODO: Try to make sure we get the exact value read in
-        decimal.getcontext().rounding = decimal.ROUND_FLOOR
-        default_voltage = round(decimal.Decimal(Config.PSU.Default.voltage), 3)
-        default_climit  = round(decimal.Decimal(Config.PSU.Default.current_limit), 3)
+        # Receive buffer for .__readline() (replies are < 100 bytes)
+        self._rxview = memoryview(bytearray(256))
+
+        # Serializes serial I/O (one message in flight), so that the
+        # instance can be shared by threads. Reentrant: .__transact() and
+        # .__transact_many() call .__write().
+        self._io_lock   = threading.RLock()
+
+        # Last response of .__transact() and recent writes and transactions
+        # as (ms, command, response), for debugging. Bounded, so that a long
+        # running daemon does not accumulate them.
+        self._last_read         = ""
+        self._transaction_log   = collections.deque(maxlen = 256)
+
+        # Last known power state, voltage and current limit settings
+        # (None = unknown)
+        self._power         = None
+        self._voltage       = None
+        self._current_limit = None
+        # .values calls since settings were last read
+        self._values_count  = 0
+
+        # Config.py's float values as decimal.Decimal, with the same 3
+        # decimals that are sent to the PSU (no global decimal context change)
+        default_voltage = decimal.Decimal("%.3f" % Config.PSU.Default.voltage)
+        default_climit  = decimal.Decimal(
+            "%.3f" % Config.PSU.Default.current_limit
+        )
 
+        if Config.PSU.Serial.baudrate not in self.BAUDRATES:
+            raise ValueError(
+                "Unsupported baud rate {} (E3631 supports: {})".format(
+                    Config.PSU.Serial.baudrate,
+                    ", ".join(str(b) for b in self.BAUDRATES)
+                )
+            )
         self.port = serial.Serial(
             port            = port or Config.PSU.Serial.port,
             baudrate        = Config.PSU.Serial.baudrate,
@@ -361,170 +725,310 @@ class PSU:
             write_timeout   = None,
             dsrdtr          = True
         )
+        PSU.low_latency(self.port)
+        # For poll()/os.readv() in .__transact() and .__readline(). The
+        # poll object is registered once, instead of select() building and
+        # scanning fd sets on every wait (also no FD_SETSIZE limit)
+        self._fd = self.port.fileno()
+        self._poll = select.poll()
+        self._poll.register(self._fd, select.POLLIN)
         # PySerial has bad habbits. See:
         # https://stackoverflow.com/questions/7266558/pyserial-buffer-wont-flush
-        # Recommended approach is to wait after opening a port
-        time.sleep(0.2)
+        # Recommended approach is to wait after opening a port. No blind
+        # delay here: .flush() already settles for 100 ms after clearing the
+        # buffers, waits for the unit to raise DTR, and the version query
+        # below is retried (VERSION_ATTEMPTS, doubling delay) until valid.
 
         # Try to clean the line and buffers
         PSU.flush(self.port)
+        # (.__waitDTR() is called regardless of the logging level)
         log.debug(
-            "DTR wait after PSU.flush(): {:1.2f} ms".format(
-                self.__waitDTR() * 1000
-            )
+            "DTR wait after PSU.flush(): %1.2f ms",
+            self.__waitDTR() * 1000
         )
 
-        # Check that it's a PSU ('yyyy.xx' return format)
+        # Check that it's a PSU ('yyyy.xx' return format). A missing, stale
+        # or garbled reply right after opening is retried with a backoff.
+        delay = self.VERSION_RETRY_DELAY
+        for attempt in range(1, self.VERSION_ATTEMPTS + 1):
+            try:
+                response = self.__transact(self.GET_VERSION)
+                if not PSU.valid_firmware_string(response):
+                    raise ValueError(
+                        "Unexpected version string '{}'".format(response)
+                    )
+                break
+            except Exception as e:
+                if attempt == self.VERSION_ATTEMPTS:
+                    raise ValueError(
+                        "Serial device does not appear to be Agilent E3631\n"
+                        + str(e)
+                    ) from None
+                log.debug(
+                    "Version query attempt %d failed (%s), retrying",
+                    attempt,
+                    e
+                )
+                time.sleep(delay)
+                delay *= 2
+
+        # Compound message capability probe. Decided once here, so that
+        # .__transact_many() can fall back to one message per command
+        # without trying (and failing) on every call.
+        self._compound = True
         try:
-            response = self.__transact("SYST:VERS?")
-            if response[4:5] != '.':
-                raise ValueError()
-            int(response[0:4])
-            int(response[5:7])
+            self.__transact_many(self.GET_VERSION, self.GET_VERSION)
         except Exception as e:
-            raise ValueError(
-                "Serial device does not appear to be Agilent E3631\n" + str(e)
-            ) from None
-
-        # TODO: Try to determine if the PSU is already initialized
-        # Setting remote does not return anything
-        self.__write("SYST:REM")
-        # If PySerial DSR/DTR control works, the above call should have not
-        # returned until the PSU DTR line is high. But we already know that
-        # it doesn't work...
-        # if not self.port.dsr:
-        #     raise ValueError("PSU DTR is low!")
-
-        # Select terminal ("channel")
-        # Seems to work for "MEAS:..." commands, but "SOUR:VOLT:IMM " could
-        # not care less ("INST:SEL" == "INST")
-        self.__write("INST {}".format(Config.PSU.Default.terminal))
-        # DTR comes up, but the PSU IS NOT READY! If you now issue some other
-        # command, the last replay is sent again ("SYST:VERS?" -> "1995.0")!!
-        # time.sleep(0.3)
-        if self.__transact("INST?") != Config.PSU.Default.terminal:
-            raise ValueError(
-                "Unable to select output terminal! Returned: '{}'".format(
-                    self._last_read
-                )
+            log.warning(
+                "Compound SCPI messages not supported, sending commands one "
+                "at a time ({})".format(str(e).replace('\n', ' '))
             )
+            self._compound = False
+            PSU.flush(self.port)
 
+        # TODO: Try to determine if the PSU is already initialized
         #
-        # Set default values
-        #
-        self.__write(
+        # Remote mode, terminal ("channel") selection and default values are
+        # sent as one compound message (one DTR wait instead of three).
+        #   "SYST:REM"  Setting remote does not return anything
+        #   "INST ..."  Seems to work for "MEAS:..." commands, but
+        #               "SOUR:VOLT:IMM " could not care less
+        #               ("INST:SEL" == "INST")
+        self.__transact_many(
+            self.SET_REMOTE,
+            "INST {}".format(Config.PSU.Default.terminal),
             "APPL {},{},{}".format(
                 Config.PSU.Default.terminal,
-                str(round(default_voltage, 3)),
-                str(round(default_climit, 3))
+                default_voltage,
+                default_climit
             )
         )
-        # AGAIN, DTR comes up, but the PSU is not ready
-        #time.sleep(__RECOVERY_DELAY__)
-        setv, setcl = self.__transact(
-            "APPL? {}".format(
-                Config.PSU.Default.terminal
+        # Verified with a separate compound query, so that a failed setup
+        # command cannot shift the responses being validated. The query
+        # waits for the PSU to raise DTR, and .__transact() retries it if
+        # no reply arrives.
+        terminal, applied = self.__transact_many(
+            self.GET_TERMINAL,
+            "APPL? {}".format(Config.PSU.Default.terminal)
+        )
+        if terminal != Config.PSU.Default.terminal:
+            raise ValueError(
+                "Unable to select output terminal! Returned: '{}'".format(
+                    terminal
+                )
             )
-        )[1:][:-1].split(",")
-        setv = decimal.Decimal(setv)
-        setcl = decimal.Decimal(setcl)
-        if setv != default_voltage:
+        match = self.APPLIED.fullmatch(applied)
+        if not match:
             raise ValueError(
-                "Default voltage setting error! '{}' != '{}'".format(
-                    setv, default_voltage
+                "Unexpected APPL? response '{}'".format(applied)
+            )
+        setv, setcl = (decimal.Decimal(v) for v in match.groups())
+        # Read back values are not necessarily exact decimal copies
+        tolerance = decimal.Decimal("0.001")
+        if abs(setv - default_voltage) >= tolerance:
+            raise ValueError(
+                "Default voltage setting error! '{}' != '{}' ({})".format(
+                    setv, default_voltage, self.next_error()
                 )
             )
-        if setcl !=  default_climit:
+        if abs(setcl - default_climit) >= tolerance:
             raise ValueError(
-                "Default current limit setting error! '{}' != '{}'".format(
-                    setcl, default_climit
+                "Default current limit setting error! '{}' != '{}' ({})".format(
+                    setcl, default_climit, self.next_error()
                 )
             )
+        self._voltage       = setv
+        self._current_limit = setcl
 
 
-    def __waitDTR(self):
-        """Use to determine when it is OK to send to PSU. This method wait for the unit to raise DTR (for us, in PySerial, port.dsr), or raises a serial.SerialTimeoutException after 500ms. For debug/testing purposes, returns the time spent waiting.
+    # NOTE: DTR (our DSR) waits poll the modem status every DSR_POLL
+    #       seconds. TIOCMIWAIT would sleep until the line changes, but it
+    #       has no timeout: bounding it needs a helper thread or a signal per
+    #       wait, and a lost transition would hang the daemon. The waits are
+    #       short (typically < 1 ms, at most a few hundred ms at connect).
+    def __waitDTR(self, timeout: float = None):
+        """Use to determine when it is OK to send to PSU. This method wait for the unit to raise DTR (for us, in PySerial, port.dsr), or raises a serial.SerialTimeoutException after 'timeout' seconds (default DTR_TIMEOUT). For debug/testing purposes, returns the time spent waiting.
         NOTE: DTR will NOT raise if the PSU has data to be read! The SCPI protocol interactions are YOUR responsibility!"""
+        if timeout is None:
+            timeout = self.DTR_TIMEOUT
         start = time.monotonic()
-        while not self.port.dsr and time.monotonic() - start < 0.5:
-            time.sleep(0.005)
-        if not self.port.dsr:
-            raise serial.SerialTimeoutException(
-                "PSU DTR did not go high within 100ms!"
-            )
+        deadline = start + timeout
+        while not self.port.dsr:
+            if time.monotonic() >= deadline:
+                raise serial.SerialTimeoutException(
+                    "PSU DTR did not go high within {:1.0f} ms!".format(
+                        timeout * 1000
+                    )
+                )
+            time.sleep(self.DSR_POLL)
         return time.monotonic() - start
 
 
-    def __write(self, command: str, ignore_dtr = False) -> None:
-        """Send SCPI command string to serial adapter."""
-        start = time.monotonic()
-        try:
-            if not ignore_dtr:
-                log.debug(
-                    "__write('{}') waited DTR for {:1.2f} ms".format(
+    def __write(
+        self,
+        command: Union[str, bytes],
+        ignore_dtr = False,
+        timeout: float = None
+    ) -> None:
+        """Send SCPI command string to serial adapter. Command may be given as str or as already encoded bytes. Optional 'timeout' (seconds) overrides DTR_TIMEOUT for the wait before sending."""
+        with self._io_lock:
+            start = time.monotonic()
+            try:
+                if not ignore_dtr:
+                    waited = self.__waitDTR(timeout)
+                    # Lazy formatting - skipped unless debug logging is enabled
+                    log.debug(
+                        "__write('%s') waited DTR for %.2f ms",
                         command,
-                        self.__waitDTR() * 1000
+                        waited * 1000
                     )
-                )
-            self.port.write((command + "\r\n").encode('utf-8'))
-        except Exception as e:
-            raise Exception(str(e) + " Command: '{}'".format(command)) from None
-        self._transaction_log.append(
-            ((time.monotonic() - start) * 1000, command, None)
-        )
-
-    def __transact(self, command: str, ignore_dtr = False) -> str:
-        """Read SCPI command response from serial adapter."""
-        start = time.monotonic()
-        self._last_read = None
-        log.debug("self._last_read set to None ('{}')".format(self._last_read))
-        retry = 3
-        while retry:
-            retry -= 1
-            # Flush is VERY IMPORTANT! You WILL get the last read otherwise
-            self.port.flush()
-            try:
-                self.__write(command, ignore_dtr)
+                if isinstance(command, str):
+                    command = command.encode('ascii')
+                self.port.write(command + self.CRLF)
             except Exception as e:
-                log.debug("__write() returned with an exception!")
-                log.debug(str(e).replace('\n', ' '))
-                raise
-            # "Surprise", PySerial's DSR/DTR hardware flow control doesn't seem
-            # to do anything at all.
-            # PSU DTR *must* become low! It indicates PSU has data to be read.
-            # Blindy going into a read before this has proven to be a bad idea.
-            # So we do this now...
-            self._loops = 0
-            while self.port.dsr:
-                # In tests, usually less than 100 loops
-                if self._loops > 1000:
-                    raise ValueError("PSU DTR does not go down!")
-                self._loops += 1
+                raise Exception(
+                    str(e) + " Command: '{}'".format(command)
+                ) from None
+            self._transaction_log.append(
+                ((time.monotonic() - start) * 1000, command, None)
+            )
 
+    # NOTE: The tty is left in the raw mode PySerial configures. Canonical
+    #       mode (ICANON) would have the kernel return whole lines, but it
+    #       also ignores VTIME (no kernel-side timeout), interprets ERASE/KILL
+    #       characters and is reset by PySerial whenever the port settings
+    #       are changed. With poll() and a bulk read, a reply is normally
+    #       received with one or two os.read() calls anyway.
+    def __readline(self, timeout: float = None) -> bytes:
+        """Read one CRLF terminated line. Returns as soon as the terminator arrives, or whatever was received when 'timeout' (seconds, default is the port timeout) expires. Waits with poll() and reads whatever is available with one os.readv() into the preallocated receive buffer, instead of PySerial's byte-at-a-time read_until()."""
+        if timeout is None:
+            timeout = self.port.timeout
+        deadline = time.monotonic() + timeout
+        rxview = self._rxview
+        poll = self._poll.poll
+        size = len(rxview)
+        received = 0
+        while received < 2 or rxview[received - 2:received] != self.CRLF:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or received == size:
+                break
+            if not poll(remaining * 1000):
+                break
+            count = os.readv(self._fd, [rxview[received:]])
+            if not count:
+                # Device disconnected
+                break
+            received += count
+        return rxview[:received].tobytes()
+
+
+    def __transact(
+        self,
+        command: Union[str, bytes],
+        ignore_dtr = False,
+        timeout: float = None
+    ) -> str:
+        """Read SCPI command response from serial adapter. Command may be given as str or as already encoded bytes. Optional 'timeout' (seconds) overrides the port read timeout and DTR_TIMEOUT for this transaction."""
+        with self._io_lock:
+            start = time.monotonic()
             self._last_read = None
-            self._last_read = self.port.read_until(b'\r\n')
-            if self._last_read[-1:] != b'\n':
-                if retry == 0:
-                    raise serial.SerialTimeoutException(
-                        "Serial readline() timeout for '{}'! ('{}')".format(
-                            command,
-                            self._last_read or "None"
+            retry = 3
+            while retry:
+                retry -= 1
+                # Discarding input is VERY IMPORTANT! You WILL get the last
+                # read otherwise. (port.flush() only waits for output to
+                # drain; reset_input_buffer() drops a stale/partial reply)
+                self.port.reset_input_buffer()
+                try:
+                    self.__write(command, ignore_dtr, timeout)
+                except Exception as e:
+                    log.debug("__write() returned with an exception!")
+                    log.debug(str(e).replace('\n', ' '))
+                    raise
+                # "Surprise", PySerial's DSR/DTR hardware flow control doesn't
+                # seem to do anything at all.
+                # PSU DTR *must* become low! It indicates PSU has data to be
+                # read. Blindy going into a read before this has proven to be
+                # a bad idea. So we do this now... Instead of spinning on the
+                # modem status, each wait is a short poll() on the port,
+                # which also returns as soon as the reply starts to arrive.
+                deadline = time.monotonic() + (timeout or self.port.timeout)
+                while self.port.dsr:
+                    if self._poll.poll(self.DSR_POLL * 1000):
+                        break
+                    if time.monotonic() > deadline:
+                        raise ValueError("PSU DTR does not go down!")
+
+                self._last_read = None
+                self._last_read = self.__readline(timeout)
+                if self._last_read[-1:] != b'\n':
+                    if retry == 0:
+                        raise serial.SerialTimeoutException(
+                            "Serial readline() timeout for '{}'! ('{}')".format(
+                                command,
+                                self._last_read or "None"
+                            )
                         )
-                    )
+                    else:
+                        log.debug("Retry #%d", retry + 1)
                 else:
-                    log.debug("Retry #{}".format(retry + 1))
-            else:
-                break
-        self._last_read = self._last_read.decode('utf-8')[:-2]
-        log.debug("__transact('{}') -> '{}'".format(command, self._last_read))
-        self._transaction_log.append(
-            ((time.monotonic() - start) * 1000, command, self._last_read)
+                    break
+            self._last_read = self._last_read.decode('utf-8')[:-2]
+            log.debug("__transact('%s') -> '%s'", command, self._last_read)
+            self._transaction_log.append(
+                ((time.monotonic() - start) * 1000, command, self._last_read)
+            )
+            return self._last_read
+
+
+    @staticmethod
+    def __compound(commands) -> bytes:
+        """Join commands (str or bytes) into one SCPI compound message. Each command is rooted (':') so that it is not interpreted relative to the previous one."""
+        return b";:".join(
+            c if isinstance(c, bytes) else c.encode('ascii')
+            for c in commands
         )
-        return self._last_read
+
+
+    def __transact_many(self, *queries, timeout: float = None) -> list:
+        """Send queries (str or bytes) as one SCPI compound message and return their responses as a list. SCPI separates the responses of a compound query with semicolons. Commands (no '?') may be included; they are executed in order and produce no response. Commands only are written without waiting for a response (returns an empty list). If the PSU does not accept compound messages, everything is sent one by one."""
+        queries = [
+            q if isinstance(q, bytes) else q.encode('ascii') for q in queries
+        ]
+        expected = sum(1 for q in queries if b'?' in q)
+        if not expected:
+            # No response will come, do not wait (and retry) for one
+            with self._io_lock:
+                if self._compound:
+                    self.__write(self.__compound(queries), timeout = timeout)
+                else:
+                    for q in queries:
+                        self.__write(q, timeout = timeout)
+            return []
+        if not self._compound:
+            responses = []
+            with self._io_lock:
+                for q in queries:
+                    if b'?' in q:
+                        responses.append(self.__transact(q, timeout = timeout))
+                    else:
+                        self.__write(q, timeout = timeout)
+            return responses
+        responses = self.__transact(
+            self.__compound(queries),
+            timeout = timeout
+        ).split(";")
+        if len(responses) != expected:
+            raise ValueError(
+                "Expected {} responses, received {} ('{}')".format(
+                    expected, len(responses), self._last_read
+                )
+            )
+        return responses
 
 
     def next_error(self):
-        _, msg = self.__transact("SYST:ERR?").split(",")
+        _, msg = self.__transact(self.GET_ERROR).split(",")
         return msg
 
 
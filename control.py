@@ -9,6 +9,8 @@
 #   0.1     2018.11.14  Initial version.
 #   0.2     2018.11.18  Added status.
 #   0.3     2019.06.13  Logging now provided by log.py.
+#   0.3.1   2026.10.15  Config lookups hoisted out of the main loop.
+#   0.3.2   2026.10.15  SET POWER receipt formatted from boolean PSU.power.
 #
 #
 # Loop that processess 'command' table rows into SCPI commands
@@ -40,9 +42,7 @@ _retry_count = 3
 # Ticker to be used ONLY in console mode!
 #
 def ticker():
-    """Rotating character. Used only on non-daemon case."""
-    if Config.PSU.Daemon.systemd:
-        return
+    """Rotating character. Used only on non-daemon, non-systemd case."""
     try:
         c = ('|', '/', '-', '\\')[ticker.value]
         ticker.value += 1
@@ -71,15 +71,19 @@ def psu():
             log.debug("PSU at port '{}'".format(ppsu.port.name))
             consecutive_error_count = 0
             lastupdate = time.time()
+            # Config does not change while running, resolve once
+            show_ticker = not (
+                Config.PSU.Daemon.run_as_daemon or Config.PSU.Daemon.systemd
+            )
             while True:
-                if not Config.PSU.Daemon.run_as_daemon:
+                if show_ticker:
                     ticker()
                 events = event.next()
                 #
                 # 'command' table read event
                 #
                 if events & IntervalScheduler.COMMAND:
-                    # (id, command, value)
+                    # sqlite3.Row (id, command, value)
                     cmd = db.command.next()
                     if cmd:
                         # cmd_receipt is a tuple of (success: boolean, value)
@@ -87,17 +91,17 @@ def psu():
                         try:
                             now = time.time()
 
-                            if cmd[1] == "SET VOLTAGE":
-                                ppsu.voltage = float(cmd[2])
+                            if cmd["command"] == "SET VOLTAGE":
+                                ppsu.voltage = float(cmd["value"])
                                 cmd_receipt = (True, str(ppsu.voltage))
 
-                            elif cmd[1] == "SET CURRENT LIMIT":
-                                ppsu.current_limit = float(cmd[2])
+                            elif cmd["command"] == "SET CURRENT LIMIT":
+                                ppsu.current_limit = float(cmd["value"])
                                 cmd_receipt = (True, str(ppsu.current_limit))
 
-                            elif cmd[1] == "SET POWER":
-                                ppsu.power = (cmd[2] == "ON")
-                                cmd_receipt = (True, ("OFF", "ON")[ppsu.power])
+                            elif cmd["command"] == "SET POWER":
+                                ppsu.power = (cmd["value"] == "ON")
+                                cmd_receipt = (True, "ON" if ppsu.power else "OFF")
 
                         except KeyboardInterrupt:
                             # re-raise to exit
@@ -120,17 +124,17 @@ def psu():
                             consecutive_error_count = 0
                         finally:
                             # TODO: Add success: boolean to Database.close()
-                            db.command.close(cmd[0], cmd_receipt[1])
+                            db.command.close(cmd["id"], cmd_receipt[1])
                             if cmd_receipt[0]:
                                 log.debug(
                                     "PSU:{} took {:1.3f} ms".format(
-                                        cmd[1], (time.time() - now)  * 1000
+                                        cmd["command"], (time.time() - now)  * 1000
                                     )
                                 )
                             else:
                                 log.error(
                                     "PSU:{} failed! (error count: {}/{})".format(
-                                        cmd[1],
+                                        cmd["command"],
                                         consecutive_error_count,
                                         _retry_count
                                     )
@@ -5,6 +5,7 @@
 # log.py - Jani Tammi <jasata@utu.fi>
 #
 #   0.1.0   2019.06.13  Initial version.
+#   0.1.1   2026.10.15  Added debug_enabled().
 #
 #
 # Global logging solution. Depends on Config.py, initializes on first import.
@@ -63,6 +64,10 @@ def remove_std_handler():
 #
 # Wrappers
 #
+def debug_enabled():
+    """True if debug messages are logged. For guarding debug messages with costly arguments (I/O, such as serial port modem line reads)."""
+    return __log.isEnabledFor(logging.DEBUG)
+
 def debug(msg, *args, **kwargs):
     __log.debug(msg, *args, **kwargs)
 
@@ -151,14 +151,18 @@ def status():
     from Database import Database
     width = 60
     print("PSU Daemon Status:")
-    # database file
+    # database file (status tuple is reused by the 'psu' table check)
+    file_status = Database.filestatus(Config.database_file)
     print(
         "{s:.<{w}} {p}".format(
             w=width,
             s="Database file '{}'".format(
                 Config.database_file
             ),
-            p=Database.filestatusstring(Config.database_file)
+            p=Database.filestatusstring(
+                Config.database_file,
+                file_status = file_status
+            )
         )
     )
     # psu -table status
@@ -166,14 +170,17 @@ def status():
         "{s:.<{w}} {p}".format(
             w=width,
             s="PSU table",
-            p=Database.psutablestatusstring(Config.database_file)
+            p=Database.psutablestatusstring(
+                Config.database_file,
+                file_status = file_status
+            )
         )
     )
     # psu -table content age
     # if over 10 seconds older than update interval, NOT OK
     update_age  = Database.lastupdate(Config.database_file)
     allowed_age = Config.PSU.Daemon.Interval.update + 10
-    if not update_age:
+    if update_age is None:
         status_msg = "no data!"
     elif update_age > allowed_age:
         status_msg = "Old data! (" + display_time(update_age) + ")"